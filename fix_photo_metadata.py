@@ -16,22 +16,212 @@ Usage:
 """
 
 import os
+import errno
 import sys
 import csv
 import argparse
 import shutil
 import json
 import re
+import functools
+import logging
+from array import array
+from itertools import compress
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from collections import defaultdict, Counter
 
+try:
+    import orjson
+except ImportError:  # optional: faster report writing
+    orjson = None
+
+# Lowercase keys: month names match case-insensitively, as strptime's %B did
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+
+_DIR_RE = re.compile(r"iCloudPhotosPart\d+of\d+")
+
+# Fixed name so worker processes (run as __mp_main__) share it
+logger = logging.getLogger("fix_photo_metadata")
+
+# Photo Details CSVs can run to hundreds of MB; read them in 1 MiB chunks
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Where scandir accepts a directory fd, DirEntry.stat() becomes an fstatat()
+# relative to it instead of resolving the full path for every photo
+_SCANDIR_FD = os.scandir in os.supports_fd and hasattr(os, 'O_DIRECTORY')
+
+# stat() errnos that Path.exists() reports as "doesn't exist" rather than raising
+_MISSING_FILE_ERRNOS = {errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP}
+
+# Bits in PhotoMetadataFixer._flags
+_FAVORITE = 1
+_HIDDEN = 2
+_DELETED = 4
+
+# Timestamp updates are syscall-latency bound, so keep many in flight at once.
+# This is the total across all CSV worker processes, not a per-process count.
+_TIMESTAMP_WORKERS = 32
+
+# Files per SetFile invocation; keeps argv well under ARG_MAX
+_SETFILE_BATCH = 256
+
+# os.link errnos meaning the output location can't hold hardlinks at all (other
+# filesystem, vfat/exFAT); organize_by_date copies the rest of the run instead
+_LINK_UNSUPPORTED_ERRNOS = {
+    code for code in (
+        errno.EXDEV, errno.EINVAL,
+        getattr(errno, 'ENOTSUP', None), getattr(errno, 'EOPNOTSUPP', None),
+    ) if code is not None
+}
+
+# os.link errnos that only concern one file (protected_hardlinks on a file the user
+# doesn't own, inode at its link limit); that file is copied and linking carries on
+_LINK_REFUSED_ERRNOS = {errno.EPERM, errno.EMLINK}
+
+# Byte-translation tables mapping a flags byte to 1 if the bit is set, else 0
+_FLAG_TABLES = {
+    flag: bytes(1 if value & flag else 0 for value in range(256))
+    for flag in (_FAVORITE, _HIDDEN, _DELETED)
+}
+
+
+def _suffix(name):
+    """Same result as Path(name).suffix, without building a Path"""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ''
+
+
+def _configure_logging():
+    """Send log records to stdout in the script's '[time] LEVEL: message' format"""
+    # StreamHandler writes and flushes each record whole, so lines from
+    # worker processes don't interleave mid-line
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s: %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+    )
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dumps(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, indent=2 if indent else None, separators=None if indent else (',', ':'),
+                      ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def _write_json(path, data):
+    """Write data as indented UTF-8 JSON"""
+    with open(path, 'wb') as f:
+        f.write(_dumps(data, indent=True))
+
+
+def _write_json_members(path, members, open_char, close_char):
+    """Stream pre-encoded members into a JSON container, one per line"""
+    with open(path, 'wb') as f:
+        f.write(open_char)
+        separator = b'\n'
+        for member in members:
+            f.write(separator)
+            f.write(member)
+            separator = b',\n'
+        f.write(b'\n' + close_char + b'\n')
+
+
+def _write_json_array(path, records):
+    """Write an iterable of records as a JSON array without materializing it"""
+    _write_json_members(path, (_dumps(record) for record in records), b'[', b']')
+
+
+def _write_json_object(path, items):
+    """Write an iterable of (key, value) pairs as a JSON object without materializing it"""
+    _write_json_members(path, (_dumps(key) + b':' + _dumps(value) for key, value in items), b'{', b'}')
+
+
+@functools.lru_cache(maxsize=65536)
+def _timestamp(creation_date):
+    return creation_date.timestamp()
+
+
+def _set_mtimes(jobs):
+    """Set atime/mtime for (path, timestamp) pairs; return {path: exception} for failures"""
+    utime = os.utime
+    failed = {}
+    for path, timestamp in jobs:
+        try:
+            utime(path, (timestamp, timestamp))
+        except Exception as e:
+            failed[path] = e
+    return failed
+
+
+def _is_digits(field, min_len, max_len):
+    return min_len <= len(field) <= max_len and field.isascii() and field.isdigit()
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_apple_date(date_string):
+    """Parse an Apple date string into a UTC datetime; raises on malformed input.
+
+    Cached because burst shots and bulk imports repeat the same minute-resolution
+    timestamp across many rows.
+    """
+    # Fixed shape: <Weekday> <Month> <D>,<YYYY> <H>:<MM> <AM/PM> GMT. Fields may be
+    # separated by runs of whitespace (e.g. a space-padded day), as strptime allowed.
+    # Unlike the old strptime code the zone must be GMT: any other zone would be
+    # silently mis-timestamped as UTC.
+    parts = date_string.split()
+    if len(parts) != 6 or parts[5] != 'GMT':
+        raise ValueError("expected '<Weekday> <Month> <D>,<YYYY> <H>:<MM> <AM/PM> GMT'")
+    month = _MONTHS[parts[1].lower()]
+    day, year = parts[2].split(',')
+    hour, minute = parts[3].split(':')
+    # Same field widths as strptime's %d,%Y %I:%M; also rules out int() extras like '+16' or '1_6'
+    if not (_is_digits(day, 1, 2) and _is_digits(year, 4, 4)
+            and _is_digits(hour, 1, 2) and _is_digits(minute, 1, 2)):
+        raise ValueError(f"malformed date fields: {parts[2]} {parts[3]}")
+    hour = int(hour)
+    if not 1 <= hour <= 12:
+        raise ValueError(f"hour out of range: {hour}")
+    meridiem = parts[4].upper()
+    if meridiem == 'PM':
+        if hour < 12:
+            hour += 12
+    elif meridiem == 'AM':
+        if hour == 12:
+            hour = 0
+    else:
+        raise ValueError(f"unknown meridiem: {parts[4]!r}")
+    return datetime(int(year), month, int(day), hour, int(minute), 0, tzinfo=timezone.utc)
+
 
 class PhotoMetadataFixer:
-    def __init__(self, base_path, dry_run=False, verbose=False):
+    # Per-file column attributes, in the order they are exchanged between processes
+    _COLUMNS = ('_paths', '_names', '_checksums', '_dates', '_sizes', '_flags')
+
+    def __init__(self, base_path, dry_run=False, verbose=False, timestamp_workers=_TIMESTAMP_WORKERS):
         self.base_path = Path(base_path)
         self.dry_run = dry_run
         self.verbose = verbose
+        self.timestamp_workers = timestamp_workers
+        self._is_darwin = sys.platform == 'darwin'
         self.stats = {
             'files_processed': 0,
             'timestamps_fixed': 0,
@@ -41,153 +231,348 @@ class PhotoMetadataFixer:
             'hidden_files': 0,
             'errors': []
         }
-        self.duplicates = defaultdict(list)
-        self.processed_files = []
+
+        # Processed files are stored column-wise; row i is spread across these
+        self._paths = []
+        self._names = []
+        self._checksums = []
+        self._dates = []
+        self._sizes = array('q')
+        self._flags = bytearray()
 
     def log(self, message, level='INFO'):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{timestamp}] {level}: {message}")
+        logger.log(logging.getLevelName(level), message)
 
     def parse_apple_date(self, date_string):
         """Parse Apple's date format: 'Saturday September 16,2023 5:27 PM GMT'"""
         try:
-            cleaned = ' '.join(date_string.split(' ')[1:-1])  # Skip weekday + GMT
-            dt = datetime.strptime(cleaned, '%B %d,%Y %I:%M %p')
-            return dt.replace(tzinfo=timezone.utc)
+            return _parse_apple_date(date_string)
         except Exception as e:
             self.log(f"Error parsing date '{date_string}': {e}", 'ERROR')
             return None
 
-    def set_file_timestamps(self, file_path, creation_date):
-        """Set file modification timestamp"""
-        if not creation_date:
-            return False
-        try:
-            timestamp = creation_date.timestamp()
-
-            if self.dry_run:
-                self.log(f"DRY RUN: Would set {file_path} timestamp to {creation_date}")
-                return True
+    def file_record(self, i):
+        """Return processed file i as a dict, for reports"""
+        flags = self._flags[i]
+        return {
+            'path': self._paths[i],
+            'name': self._names[i],
+            'checksum': self._checksums[i],
+            'favorite': bool(flags & _FAVORITE),
+            'hidden': bool(flags & _HIDDEN),
+            'deleted': bool(flags & _DELETED),
+            'original_date': self._dates[i],
+            'size': self._sizes[i],
+        }
 
-            os.utime(file_path, (timestamp, timestamp))
+    def count_flag(self, flag, start=0):
+        """Count processed files from row start onwards that have the given flag bit set"""
+        return self._flags[start:].translate(_FLAG_TABLES[flag]).count(1)
 
-            if sys.platform == 'darwin':
-                os.system(f'SetFile -d "{creation_date.strftime("%m/%d/%Y %H:%M:%S")}" "{file_path}"')
+    def rows_with_flag(self, flag):
+        """Iterate over indexes of processed files that have the given flag bit set"""
+        return compress(range(len(self._flags)), self._flags.translate(_FLAG_TABLES[flag]))
 
-            self.log(f"Fixed timestamp for {file_path.name}")
-            return True
+    def apply_timestamps(self, pending):
+        """Set file modification timestamps for (file_path, creation_date) pairs using a thread pool"""
+        if not pending:
+            return
 
+        if self.dry_run:
+            for file_path, creation_date in pending:
+                self.log(f"DRY RUN: Would set {file_path} timestamp to {creation_date}")
+            self.stats['timestamps_fixed'] += len(pending)
+            return
+
+        jobs = [(file_path, _timestamp(creation_date)) for file_path, creation_date in pending]
+        # One contiguous chunk per worker, so each thread runs a plain loop instead of a future per file
+        chunk_size = -(-len(jobs) // self.timestamp_workers)
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+        with ThreadPoolExecutor(max_workers=self.timestamp_workers) as pool:
+            failed = {}
+            for chunk_failures in pool.map(_set_mtimes, chunks):
+                failed.update(chunk_failures)
+
+            for file_path, e in failed.items():
+                error_msg = f"Failed to set timestamp for {file_path}: {e}"
+                self.log(error_msg, 'ERROR')
+                self.stats['errors'].append(error_msg)
+            self.stats['timestamps_fixed'] += len(jobs) - len(failed)
+
+            fixed = [item for item in pending if item[0] not in failed]
+            if self.verbose:
+                for file_path, _ in fixed:
+                    self.log(f"Fixed timestamp for {os.path.basename(file_path)}")
+
+            if self._is_darwin:
+                for _ in pool.map(self.run_setfile, self.setfile_commands(fixed)):
+                    pass
+
+    def setfile_commands(self, fixed):
+        """Build SetFile commands that share one invocation per distinct creation date"""
+        by_date = defaultdict(list)
+        for file_path, creation_date in fixed:
+            by_date[creation_date].append(str(file_path))
+
+        commands = []
+        for creation_date, paths in by_date.items():
+            date_arg = creation_date.strftime("%m/%d/%Y %H:%M:%S")
+            for i in range(0, len(paths), _SETFILE_BATCH):
+                commands.append(['SetFile', '-d', date_arg, *paths[i:i + _SETFILE_BATCH]])
+        return commands
+
+    def run_setfile(self, command):
+        """Set macOS creation dates for a batch of files"""
+        try:
+            subprocess.run(command, check=False)
         except Exception as e:
-            error_msg = f"Failed to set timestamp for {file_path}: {e}"
+            error_msg = f"Failed to set creation date for {len(command) - 3} files: {e}"
             self.log(error_msg, 'ERROR')
             self.stats['errors'].append(error_msg)
-            return False
 
     def process_csv_file(self, csv_path):
         """Process a single CSV file and fix timestamps for photos in the same directory"""
         self.log(f"Processing CSV: {csv_path}")
+        pending = []
+        first_row = len(self._paths)
+        dir_fd = None
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+            # One directory read per CSV; DirEntry caches its stat result
+            if _SCANDIR_FD:
+                dir_fd = os.open(csv_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            with os.scandir(csv_path.parent if dir_fd is None else dir_fd) as it:
+                dir_entries = {entry.name: entry for entry in it}
+
+            with open(csv_path, 'r', encoding='utf-8', newline='', buffering=_CSV_BUFFER_SIZE) as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return
+                # Resolve column positions once instead of building a dict per row
+                idx = {name: i for i, name in enumerate(header)}
+                i_img = idx['imgName']
+                i_checksum = idx['fileChecksum']
+                i_favorite = idx['favorite']
+                i_hidden = idx['hidden']
+                i_deleted = idx['deleted']
+                i_date = idx['originalCreationDate']
+
+                # Build paths as strings; a Path object per row costs more than the rest of the row
+                parent_dir = str(csv_path.parent)
+                prefix = '' if parent_dir == os.curdir else os.path.join(parent_dir, '')
+
+                parse_date = self.parse_apple_date
+                get_entry = dir_entries.get
+                paths_append = self._paths.append
+                names_append = self._names.append
+                checksums_append = self._checksums.append
+                dates_append = self._dates.append
+                sizes_append = self._sizes.append
+                flags_append = self._flags.append
+                pending_append = pending.append
+
                 for row in reader:
-                    img_name = row['imgName']
-                    file_checksum = row['fileChecksum']
-                    favorite = row['favorite'] == 'yes'
-                    hidden = row['hidden'] == 'yes'
-                    deleted = row['deleted'] == 'yes'
-                    original_date = self.parse_apple_date(row['originalCreationDate'])
-                    view_count = int(row['viewCount'])
-
-                    file_path = csv_path.parent / img_name
-                    if not file_path.exists():
+                    if not row:
+                        continue
+                    img_name = row[i_img]
+                    file_checksum = row[i_checksum]
+                    favorite = row[i_favorite] == 'yes'
+                    hidden = row[i_hidden] == 'yes'
+                    deleted = row[i_deleted] == 'yes'
+                    original_date = parse_date(row[i_date])
+
+                    file_path = prefix + img_name
+                    entry = get_entry(img_name)
+                    try:
+                        # Fall back to a path stat for names that only match case-insensitively
+                        size = entry.stat().st_size if entry is not None else os.stat(file_path).st_size
+                    except OSError as e:
+                        if e.errno not in _MISSING_FILE_ERRNOS:
+                            raise
                         self.log(f"File not found: {file_path}", 'WARNING')
                         continue
 
-                    file_info = {
-                        'path': str(file_path),
-                        'name': img_name,
-                        'checksum': file_checksum,
-                        'favorite': favorite,
-                        'hidden': hidden,
-                        'deleted': deleted,
-                        'original_date': original_date,
-                        'view_count': view_count,
-                        'size': file_path.stat().st_size
-                    }
-                    self.processed_files.append(file_info)
-                    self.duplicates[file_checksum].append(file_info)
-
-                    self.stats['files_processed'] += 1
-                    if favorite:
-                        self.stats['favorites'] += 1
-                    if hidden:
-                        self.stats['hidden_files'] += 1
-                    if deleted:
-                        self.stats['deleted_files'] += 1
-
-                    if original_date and self.set_file_timestamps(file_path, original_date):
-                        self.stats['timestamps_fixed'] += 1
+                    paths_append(file_path)
+                    names_append(img_name)
+                    checksums_append(file_checksum)
+                    dates_append(original_date)
+                    sizes_append(size)
+                    flags_append(
+                        (_FAVORITE if favorite else 0)
+                        | (_HIDDEN if hidden else 0)
+                        | (_DELETED if deleted else 0)
+                    )
+
+                    if original_date:
+                        pending_append((file_path, original_date))
 
         except Exception as e:
             error_msg = f"Error processing CSV {csv_path}: {e}"
             self.log(error_msg, 'ERROR')
             self.stats['errors'].append(error_msg)
+        finally:
+            # DirEntry.stat() uses dir_fd, so it stays open until the rows are read
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+        # Count flags over this CSV's rows at once rather than branching per row
+        self.stats['files_processed'] += len(self._paths) - first_row
+        self.stats['favorites'] += self.count_flag(_FAVORITE, first_row)
+        self.stats['hidden_files'] += self.count_flag(_HIDDEN, first_row)
+        self.stats['deleted_files'] += self.count_flag(_DELETED, first_row)
+
+        # Rows read before a CSV error still get their timestamps fixed
+        self.apply_timestamps(pending)
+
+    def process_csv_files(self, csv_paths):
+        """Process CSV files in parallel worker processes and merge their results in order"""
+        if len(csv_paths) <= 1:
+            for csv_path in csv_paths:
+                self.process_csv_file(csv_path)
+            return
+
+        processes = min(len(csv_paths), os.cpu_count() or 1)
+        # Split the thread budget across processes so utime/SetFile concurrency stays bounded
+        threads = max(1, self.timestamp_workers // processes)
+        # Spawned workers don't run main(), so they set up the same stdout logging
+        with ProcessPoolExecutor(max_workers=processes, initializer=_configure_logging) as pool:
+            results = pool.map(
+                _process_csv_worker,
+                [(self.base_path, self.dry_run, self.verbose, threads, csv_path) for csv_path in csv_paths],
+            )
+            for columns, stats in results:
+                self.merge_results(columns, stats)
+
+    def export_results(self):
+        """Return (columns, stats) for merging into another fixer"""
+        return [getattr(self, name) for name in self._COLUMNS], self.stats
+
+    def merge_results(self, columns, stats):
+        """Append another fixer's exported results to this one"""
+        for name, column in zip(self._COLUMNS, columns):
+            getattr(self, name).extend(column)
+
+        for key, value in stats.items():
+            if key == 'errors':
+                self.stats['errors'].extend(value)
+            else:
+                self.stats[key] += value
 
     def process_all_directories(self):
         self.log("Starting to process all directories...")
 #        pattern = "iCloud Fotos Teil * von 37"
 #        directories = [item for item in self.base_path.iterdir() if item.is_dir() and "iCloud Fotos Teil" in item.name and "von 37" in item.name]
 #        directories.sort()
-        pattern = re.compile(r"iCloudPhotosPart\d+of\d+")
-        directories = [item for item in self.base_path.iterdir() if item.is_dir() and pattern.match(item.name)]
+        with os.scandir(self.base_path) as it:
+            directories = [Path(entry.path) for entry in it if _DIR_RE.fullmatch(entry.name) and entry.is_dir()]
         directories.sort()
 
         self.log(f"Found {len(directories)} directories to process")
 
+        csv_files = []
         for directory in directories:
-            csv_files = list(directory.glob("Photo Details*.csv"))
-            if not csv_files:
+            dir_csv_files = list(directory.glob("Photo Details*.csv"))
+            if not dir_csv_files:
                 self.log(f"No CSV files found in {directory}", 'WARNING')
                 continue
-            for csv_file in csv_files:
-                self.process_csv_file(csv_file)
+            csv_files.extend(dir_csv_files)
+
+        self.process_csv_files(csv_files)
 
         self.log("Finished processing all directories")
         self.print_summary()
 
+    def duplicate_groups(self):
+        """Map each repeated checksum to its row indexes, in first-seen order"""
+        # Count in C first so only the (rare) repeated checksums get Python-level lists
+        repeated = {checksum for checksum, count in Counter(self._checksums).items() if count > 1}
+        groups = defaultdict(list)
+        if repeated:
+            for i, checksum in enumerate(self._checksums):
+                if checksum in repeated:
+                    groups[checksum].append(i)
+        return groups
+
     def find_duplicates(self):
-        duplicates = {k: v for k, v in self.duplicates.items() if len(v) > 1}
+        """Log duplicate sets and return them as {checksum: row indexes}"""
+        duplicates = self.duplicate_groups()
         self.stats['duplicates_found'] = len(duplicates)
         if duplicates:
             self.log(f"Found {len(duplicates)} sets of duplicate files:")
-            for checksum, files in duplicates.items():
-                self.log(f"  Checksum {checksum}: {len(files)} files")
-                for file_info in files:
-                    self.log(f"    - {file_info['path']} ({file_info['size']} bytes)")
+            for checksum, rows in duplicates.items():
+                self.log(f"  Checksum {checksum}: {len(rows)} files")
+                for i in rows:
+                    self.log(f"    - {self._paths[i]} ({self._sizes[i]} bytes)")
         return duplicates
 
-    def organize_by_date(self, output_dir):
+    def link_file(self, src, dst):
+        """Hardlink src to dst, replacing dst unless it already is the same file"""
+        try:
+            os.link(src, dst)
+        except FileExistsError:
+            if os.path.samefile(src, dst):
+                return
+            os.unlink(dst)
+            os.link(src, dst)
+
+    def copy_file(self, src, dst):
+        """Copy src to dst with metadata, replacing dst"""
+        try:
+            shutil.copy2(src, dst)
+        except shutil.SameFileError:
+            # dst is a hardlink from an earlier run; replace it with a real copy
+            os.unlink(dst)
+            shutil.copy2(src, dst)
+
+    def organize_by_date(self, output_dir, copy=False):
+        """Hardlink (or with copy=True, copy) dated files into output_dir/YYYY/MM"""
         output_path = Path(output_dir)
         if not self.dry_run:
             output_path.mkdir(exist_ok=True)
 
         self.log(f"Organizing files by date in {output_path}")
 
-        for file_info in self.processed_files:
-            if not file_info['original_date']:
+        # (year, month) -> (year_month, target_prefix), where target_prefix is the bucket's
+        # directory path as a string ending in a separator; each bucket is formatted and created once
+        target_dirs = {}
+
+        for path, name, date in zip(self._paths, self._names, self._dates):
+            if not date:
                 continue
 
-            date = file_info['original_date']
-            year_month = f"{date.year}/{date.month:02d}"
-            target_dir = output_path / year_month
-            target_file = target_dir / file_info['name']
+            key = (date.year, date.month)
+            cached = target_dirs.get(key)
+            if cached is None:
+                year_month = f"{date.year}/{date.month:02d}"
+                target_dir = output_path / year_month
+                if not self.dry_run:
+                    target_dir.mkdir(parents=True, exist_ok=True)
+                cached = target_dirs[key] = (year_month, os.path.join(target_dir, ''))
+            year_month, target_prefix = cached
+            target_file = target_prefix + name
 
             if self.dry_run:
-                self.log(f"DRY RUN: Would move {file_info['path']} to {target_file}")
+                self.log(f"DRY RUN: Would {'copy' if copy else 'link'} {path} to {target_file}")
             else:
-                target_dir.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(file_info['path'], target_file)
-                self.log(f"Copied {file_info['name']} to {year_month}/")
+                action = 'Copied'
+                if copy:
+                    self.copy_file(path, target_file)
+                else:
+                    try:
+                        self.link_file(path, target_file)
+                        action = 'Linked'
+                    except OSError as e:
+                        if e.errno in _LINK_UNSUPPORTED_ERRNOS:
+                            self.log(f"Cannot hardlink into {output_path} ({e}); copying files instead", 'WARNING')
+                            copy = True
+                        elif e.errno in _LINK_REFUSED_ERRNOS:
+                            self.log(f"Cannot hardlink {path} ({e}); copying it instead", 'WARNING')
+                        else:
+                            raise
+                        self.copy_file(path, target_file)
+                if self.verbose:
+                    self.log(f"{action} {name} to {year_month}/")
 
     def generate_reports(self, output_dir):
         output_path = Path(output_dir)
@@ -195,46 +580,39 @@ class PhotoMetadataFixer:
             output_path.mkdir(exist_ok=True)
 
         stats_file = output_path / "photo_statistics.json"
-        year_counts = Counter()
-        file_type_counts = Counter()
-
-        for file_info in self.processed_files:
-            if file_info['original_date']:
-                year_counts[file_info['original_date'].year] += 1
-            ext = Path(file_info['name']).suffix.lower()
-            file_type_counts[ext] += 1
+        # Counter consumes iterables in C, so avoid per-row Python increments
+        year_counts = Counter(date.year for date in self._dates if date)
+        file_type_counts = Counter(_suffix(name).lower() for name in self._names)
 
         detailed_stats = {
             **self.stats,
             'years': dict(year_counts),
             'file_types': dict(file_type_counts),
-            'total_size_gb': sum(f['size'] for f in self.processed_files) / (1024**3)
+            'total_size_gb': sum(self._sizes) / (1024**3)
         }
 
         if not self.dry_run:
-            with open(stats_file, 'w') as f:
-                json.dump(detailed_stats, f, indent=2, default=str)
+            _write_json(stats_file, detailed_stats)
 
+        # Record reports are streamed one record at a time rather than built up front
         duplicates = self.find_duplicates()
         if duplicates:
             dupes_file = output_path / "duplicates.json"
             if not self.dry_run:
-                with open(dupes_file, 'w') as f:
-                    json.dump(duplicates, f, indent=2, default=str)
+                _write_json_object(dupes_file, (
+                    (checksum, [self.file_record(i) for i in rows])
+                    for checksum, rows in duplicates.items()
+                ))
 
-        favorites = [f for f in self.processed_files if f['favorite']]
-        if favorites:
+        if self.count_flag(_FAVORITE):
             favorites_file = output_path / "favorites.json"
             if not self.dry_run:
-                with open(favorites_file, 'w') as f:
-                    json.dump(favorites, f, indent=2, default=str)
+                _write_json_array(favorites_file, map(self.file_record, self.rows_with_flag(_FAVORITE)))
 
-        deleted = [f for f in self.processed_files if f['deleted']]
-        if deleted:
+        if self.count_flag(_DELETED):
             deleted_file = output_path / "deleted_files.json"
             if not self.dry_run:
-                with open(deleted_file, 'w') as f:
-                    json.dump(deleted, f, indent=2, default=str)
+                _write_json_array(deleted_file, map(self.file_record, self.rows_with_flag(_DELETED)))
 
         self.log(f"Generated reports in {output_path}")
 
@@ -252,16 +630,27 @@ class PhotoMetadataFixer:
                 self.log(f"  - {error}")
 
 
+def _process_csv_worker(args):
+    """Process one CSV in a worker process and return its exported results"""
+    base_path, dry_run, verbose, timestamp_workers, csv_path = args
+    fixer = PhotoMetadataFixer(base_path, dry_run=dry_run, verbose=verbose, timestamp_workers=timestamp_workers)
+    fixer.process_csv_file(csv_path)
+    return fixer.export_results()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fix iCloud Photos metadata and timestamps")
     parser.add_argument("path", help="Base path containing iCloud photo directories OR single directory")
     parser.add_argument("--single-dir", action="store_true", help="Process only specified directory")
     parser.add_argument("--dry-run", action="store_true", help="Simulate actions without making changes")
     parser.add_argument("--organize", help="Organize files by date into specified output folder")
+    parser.add_argument("--copy", action="store_true",
+                        help="With --organize, copy files instead of hardlinking them (uses extra disk space)")
     parser.add_argument("--reports", help="Generate reports in specified folder")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
 
     args = parser.parse_args()
+    _configure_logging()
 
     if not os.path.exists(args.path):
         print(f"Error: Path '{args.path}' does not exist")
@@ -276,9 +665,7 @@ def main():
             print(f"Error: No CSV files found in {target_dir}")
             sys.exit(1)
 
-        for csv_file in csv_files:
-            fixer.process_csv_file(csv_file)
-
+        fixer.process_csv_files(csv_files)
         fixer.print_summary()
     else:
         fixer.process_all_directories()
@@ -287,7 +674,7 @@ def main():
         fixer.generate_reports(args.reports)
 
     if args.organize:
-        fixer.organize_by_date(args.organize)
+        fixer.organize_by_date(args.organize, copy=args.copy)
 
 
 if __name__ == "__main__":